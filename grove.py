@@ -27,16 +27,14 @@ import argparse
 import sys
 import os
 import csv
-from pathlib import Path
-import re
-from typing import List, Dict, Optional, Optional, Any
+from collections import Counter
+from typing import List, Dict, FrozenSet, Optional
 
 # Import the core functionality from Grove's parsing engine
-from grove_core import (
-    extract_courses_data, parse_courses, parse_prerequisites,
-    check_prerequisites_met, is_graduate_course, filter_by_academic_level,
-    get_eligible_courses, search_courses_by_major
-)
+from grove_core import load_courses_cached, normalize_course_code
+
+# Whether stdout is a terminal, checked once at import
+_IS_TTY = sys.stdout.isatty()
 
 # Color codes for terminal output
 class Colors:
@@ -50,12 +48,26 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-def colorize(text: str, color: str) -> str:
-    """Add color to text if terminal supports it"""
-    if sys.stdout.isatty():
-        return f"{color}{text}{Colors.ENDC}"
+# Supported majors, in the order shown by --help
+MAJOR_CHOICES = ('EE', 'CpE', 'CS', 'IT', 'EE2', 'CpE1', 'EE3')
+
+def _colorize(text: str, color: str) -> str:
+    """Wrap text in the given terminal color code"""
+    return f"{color}{text}{Colors.ENDC}"
+
+def _no_color(text: str, color: str) -> str:
+    """Return text unchanged when output is not a terminal"""
     return text
 
+# Add color to text if terminal supports it
+colorize = _colorize if _IS_TTY else _no_color
+
+# Field labels repeated for every course in the verbose listing, colorized once
+_LBL_MAJORS = colorize('Majors:', Colors.CYAN)
+_LBL_LEVEL = colorize('Level:', Colors.CYAN)
+_LBL_PREREQS = colorize('Prerequisites:', Colors.CYAN)
+_LBL_DESCRIPTION = colorize('Description:', Colors.CYAN)
+
 def show_grove_header():
     """Display the Grove ASCII art header"""
     header = f"""
@@ -82,105 +94,102 @@ def format_prerequisites_for_display(prereq_expr) -> str:
     # For CLI display, we'll show a simplified version
     return str(prereq_expr)
 
+def load_courses(pdf_path: str) -> List[Dict]:
+    """Load prepared courses from the PDF (parsing is cached on disk by grove_core)"""
+    return prepare_courses(load_courses_cached(pdf_path))
+
+def prepare_courses(courses: List[Dict]) -> List[Dict]:
+    """Precompute derived per-course fields once so display/export don't re-derive them"""
+    # parse_courses has already set '_is_grad', '_prereqs', '_majors_tuple' and '_desc_lower'
+    for course in courses:
+        course['_prereqs_text'] = format_prerequisites_for_display(course['_prereqs'])
+        course['_prereq_set'] = frozenset(map(normalize_course_code, course['_prereqs']))
+        course['_level'] = 'Graduate' if course['_is_grad'] else 'Undergraduate'
+        course['_code_lower'] = course['course_code'].lower()
+    _intern_identifiers(courses)
+    return courses
+
+def _intern_identifiers(courses: List[Dict]):
+    """Intern the short, heavily compared identifiers so set/dict lookups hit on identity"""
+    for course in courses:
+        course['course_code'] = sys.intern(course['course_code'])
+        course['_majors_tuple'] = tuple(map(sys.intern, course['_majors_tuple']))
+
 def load_completed_courses(file_path: str) -> List[str]:
     """Load completed courses from a text file"""
-    if not os.path.exists(file_path):
-        print(f"{colorize('Error:', Colors.RED)} Completed courses file '{file_path}' not found.")
-        sys.exit(1)
-    
-    completed = []
     try:
+        # Support both line-by-line and comma-separated formats, streaming the
+        # file line by line; dict keys drop duplicates while preserving order
+        completed = {}
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-            # Support both line-by-line and comma-separated formats
-            # First, try to split by lines
-            lines = content.strip().split('\n')
-            for line in lines:
+            for line in f:
                 line = line.strip()
                 if not line or line.startswith('#'):  # Skip empty lines and comments
                     continue
                 
-                # Check if line contains commas (comma-separated format)
-                if ',' in line:
-                    courses_in_line = [c.strip().upper() for c in line.split(',')]
-                    completed.extend([c for c in courses_in_line if c])
-                else:
-                    # Single course per line
-                    if line.upper():
-                        completed.append(line.upper())
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_completed = []
-        for course in completed:
-            if course not in seen:
-                seen.add(course)
-                unique_completed.append(course)
+                for token in line.split(','):
+                    token = token.strip().upper()
+                    if token:
+                        completed[sys.intern(token)] = None
         
-        return unique_completed
+        return list(completed)
         
+    except FileNotFoundError:
+        print(f"{colorize('Error:', Colors.RED)} Completed courses file '{file_path}' not found.")
+        sys.exit(1)
     except Exception as e:
         print(f"{colorize('Error:', Colors.RED)} Failed to read completed courses file: {e}")
         sys.exit(1)
 
-def validate_major(major: str) -> bool:
-    """Validate if the major is supported"""
-    valid_majors = ['EE', 'CpE', 'CS', 'IT', 'EE2', 'CpE1', 'EE3']
-    return major in valid_majors
-
 def search_courses(courses: List[Dict], query: str) -> List[Dict]:
-    """Search courses by query in course code or description"""
+    """Search prepared courses by query in course code or description"""
     query_lower = query.lower()
-    results = []
-    
-    for course in courses:
-        # Search in course code
-        if query_lower in course['course_code'].lower():
-            results.append(course)
-            continue
-        
-        # Search in description
-        if query_lower in course['full_description'].lower():
-            results.append(course)
-            continue
-    
-    return results
+    return [course for course in courses
+            if query_lower in course['_code_lower'] or query_lower in course['_desc_lower']]
 
-def display_stats(courses: List[Dict], completed_courses: Optional[List[str]] = None):
+def compute_eligibility(courses: List[Dict], completed_courses: FrozenSet[str]) -> Dict[str, bool]:
+    """Map course codes to prereqs_met; the display/export helpers call this when no map is passed"""
+    # Like get_eligible_courses, this only covers undergraduate courses
+    completed_normalized = frozenset(map(normalize_course_code, completed_courses))
+    return {c['course_code']: c['_prereq_set'] <= completed_normalized
+            for c in courses if not c['_is_grad']}
+
+def display_stats(courses: List[Dict], completed_courses: Optional[FrozenSet[str]] = None,
+                  eligibility: Optional[Dict[str, bool]] = None):
     """Display course statistics"""
     total = len(courses)
-    undergrad = len([c for c in courses if not is_graduate_course(c)])
-    grad = total - undergrad
+    grad = sum(1 for c in courses if c['_is_grad'])
+    undergrad = total - grad
     
     # Count by major
-    major_counts = {}
+    major_counts = Counter()
     for course in courses:
-        majors = course['majors'].split(', ')
-        for major in majors:
-            major = major.strip()
-            major_counts[major] = major_counts.get(major, 0) + 1
+        major_counts.update(course['_majors_tuple'])
     
-    print(f"\n{colorize('=== COURSE STATISTICS ===', Colors.HEADER)}")
-    print(f"{colorize('Total Courses:', Colors.BOLD)} {total}")
-    print(f"{colorize('Undergraduate:', Colors.BLUE)} {undergrad}")
-    print(f"{colorize('Graduate:', Colors.CYAN)} {grad}")
+    lines = [f"\n{colorize('=== COURSE STATISTICS ===', Colors.HEADER)}"]
+    lines.append(f"{colorize('Total Courses:', Colors.BOLD)} {total}")
+    lines.append(f"{colorize('Undergraduate:', Colors.BLUE)} {undergrad}")
+    lines.append(f"{colorize('Graduate:', Colors.CYAN)} {grad}")
     
-    print(f"\n{colorize('Courses by Major:', Colors.BOLD)}")
+    lines.append(f"\n{colorize('Courses by Major:', Colors.BOLD)}")
     for major, count in sorted(major_counts.items()):
-        print(f"  {colorize(major + ':', Colors.YELLOW)} {count}")
+        lines.append(f"  {colorize(major + ':', Colors.YELLOW)} {count}")
     
     if completed_courses:
-        eligible_courses = get_eligible_courses(courses, completed_courses)
-        eligible_count = len([c for c in eligible_courses if c['prereqs_met']])
-        ineligible_count = len(eligible_courses) - eligible_count - len(completed_courses)
+        if eligibility is None:
+            eligibility = compute_eligibility(courses, completed_courses)
+        eligible_count = sum(1 for met in eligibility.values() if met)
+        ineligible_count = len(eligibility) - eligible_count - len(completed_courses)
         
-        print(f"\n{colorize('Your Progress:', Colors.BOLD)}")
-        print(f"  {colorize('[OK] Completed:', Colors.GREEN)} {len(completed_courses)}")
-        print(f"  {colorize('[OK] Eligible to take:', Colors.GREEN)} {eligible_count}")
-        print(f"  {colorize('[X] Need prerequisites:', Colors.RED)} {ineligible_count}")
+        lines.append(f"\n{colorize('Your Progress:', Colors.BOLD)}")
+        lines.append(f"  {colorize('[OK] Completed:', Colors.GREEN)} {len(completed_courses)}")
+        lines.append(f"  {colorize('[OK] Eligible to take:', Colors.GREEN)} {eligible_count}")
+        lines.append(f"  {colorize('[X] Need prerequisites:', Colors.RED)} {ineligible_count}")
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-def display_table(courses: List[Dict], verbose: bool = False, completed_courses: Optional[List[str]] = None):
+def display_table(courses: List[Dict], verbose: bool = False, completed_courses: Optional[FrozenSet[str]] = None,
+                  eligibility: Optional[Dict[str, bool]] = None):
     """Display courses in table format"""
     if not courses:
         print(f"{colorize('No courses found.', Colors.YELLOW)}")
@@ -189,126 +198,120 @@ def display_table(courses: List[Dict], verbose: bool = False, completed_courses:
     # All courses are displayed
     display_courses = courses
     
-    # Determine eligibility status if completed courses provided
-    eligibility_info = {}
-    if completed_courses:
-        eligible_courses = get_eligible_courses(display_courses, completed_courses)
-        for course in eligible_courses:
-            code = course['course_code']
-            if code in completed_courses:
-                eligibility_info[code] = ('[OK]', Colors.GREEN)
-            elif course['prereqs_met']:
-                eligibility_info[code] = ('[OK]', Colors.GREEN)
-            else:
-                eligibility_info[code] = ('[X]', Colors.RED)
+    if completed_courses and eligibility is None:
+        eligibility = compute_eligibility(display_courses, completed_courses)
     
+    lines = []
     if verbose:
+        # Determine eligibility status if completed courses provided
+        eligibility_info = {}
+        if completed_courses:
+            eligibility_info = {
+                code: ('[OK]', Colors.GREEN) if code in completed_courses or prereqs_met else ('[X]', Colors.RED)
+                for code, prereqs_met in eligibility.items()
+            }
+        
         # Detailed format
-        print(f"\n{colorize('=== COURSE DETAILS ===', Colors.HEADER)}")
+        lines.append(f"\n{colorize('=== COURSE DETAILS ===', Colors.HEADER)}")
         for i, course in enumerate(display_courses, 1):
             status_symbol, status_color = eligibility_info.get(course['course_code'], ('', ''))
             
             course_title = f"{i}. {course['course_code']}"
-            print(f"\n{colorize(course_title, Colors.BOLD)} {colorize(status_symbol, status_color)}")
-            print(f"   {colorize('Majors:', Colors.CYAN)} {course['majors']}")
-            print(f"   {colorize('Level:', Colors.CYAN)} {'Graduate' if is_graduate_course(course) else 'Undergraduate'}")
+            lines.append(f"\n{colorize(course_title, Colors.BOLD)} {colorize(status_symbol, status_color)}")
+            lines.append(f"   {_LBL_MAJORS} {course['majors']}")
+            lines.append(f"   {_LBL_LEVEL} {course['_level']}")
             
-            prereqs = parse_prerequisites(course['full_description'])
-            prereq_text = format_prerequisites_for_display(prereqs)
-            print(f"   {colorize('Prerequisites:', Colors.CYAN)} {prereq_text}")
+            lines.append(f"   {_LBL_PREREQS} {course['_prereqs_text']}")
             
             # Truncate description for readability
-            desc = course['full_description'][:200] + '...' if len(course['full_description']) > 200 else course['full_description']
-            print(f"   {colorize('Description:', Colors.CYAN)} {desc}")
+            full_desc = course['full_description']
+            desc = full_desc if len(full_desc) <= 200 else full_desc[:200] + '...'
+            lines.append(f"   {_LBL_DESCRIPTION} {desc}")
     else:
         # Simple table format
-        print(f"\n{colorize('=== COURSES ===', Colors.HEADER)}")
+        lines.append(f"\n{colorize('=== COURSES ===', Colors.HEADER)}")
         
         # Table headers
         headers = ['Course', 'Majors', 'Level', 'Prerequisites']
         if completed_courses:
             headers.append('Status')
         
-        # Calculate column widths
+        # Materialize each row's text once, then size the columns from it
+        rows = [
+            (course['course_code'], course['majors'],
+             course['_level'], course['_prereqs_text'])
+            for course in display_courses
+        ]
         col_widths = [max(len(h), 12) for h in headers]
-        for course in display_courses:
-            prereqs = parse_prerequisites(course['full_description'])
-            prereq_text = format_prerequisites_for_display(prereqs)
-            
-            widths = [
-                len(course['course_code']),
-                len(course['majors']),
-                len('Graduate' if is_graduate_course(course) else 'Undergraduate'),
-                len(prereq_text)
-            ]
-            
-            for i, width in enumerate(widths):
-                col_widths[i] = max(col_widths[i], width)
+        for i, column in enumerate(zip(*rows)):
+            col_widths[i] = max(col_widths[i], max(map(len, column)))
+        
+        # Lay out the plain-text columns once; each row is then a single format call
+        row_fmt = ' | '.join(f"{{:<{w}}}" for w in col_widths[:4])
+        
+        # Every possible Status cell, padded before colorizing (so escape codes
+        # don't count toward the width) and keyed by the course's prereqs_met
+        if completed_courses:
+            status_width = col_widths[4]
+            completed_cell = colorize(f"{'Completed':<{status_width}}", Colors.GREEN)
+            status_cells = {
+                True: colorize(f"{'Eligible':<{status_width}}", Colors.GREEN),
+                False: colorize(f"{'Need Prereqs':<{status_width}}", Colors.RED),
+                None: colorize(f"{'Unknown':<{status_width}}", ''),
+            }
         
         # Print headers
-        header_row = ' | '.join(h.ljust(w) for h, w in zip(headers, col_widths))
-        print(colorize(header_row, Colors.BOLD))
-        print('-' * len(header_row))
+        header_row = ' | '.join(f"{h:<{w}}" for h, w in zip(headers, col_widths))
+        lines.append(colorize(header_row, Colors.BOLD))
+        lines.append('-' * len(header_row))
         
         # Print courses
-        for course in display_courses:
-            prereqs = parse_prerequisites(course['full_description'])
-            prereq_text = format_prerequisites_for_display(prereqs)
-            
-            row_data = [
-                course['course_code'].ljust(col_widths[0]),
-                course['majors'].ljust(col_widths[1]),
-                ('Graduate' if is_graduate_course(course) else 'Undergraduate').ljust(col_widths[2]),
-                prereq_text.ljust(col_widths[3])
-            ]
+        for row_data in rows:
+            code = row_data[0]
+            row = row_fmt.format(*row_data)
             
             if completed_courses:
-                status_symbol, status_color = eligibility_info.get(course['course_code'], ('?', ''))
-                status_text = 'Completed' if course['course_code'] in completed_courses else \
-                             'Eligible' if status_symbol == '[OK]' else \
-                             'Need Prereqs' if status_symbol == '[X]' else 'Unknown'
-                row_data.append(colorize(status_text.ljust(col_widths[4]), status_color))
+                if code in completed_courses:
+                    row += ' | ' + completed_cell
+                else:
+                    row += ' | ' + status_cells[eligibility.get(code)]
             
-            print(' | '.join(row_data))
+            lines.append(row)
+    
+    # Emit the whole listing with a single write instead of one print per line
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-def export_to_csv(courses: List[Dict], filename: str, completed_courses: Optional[List[str]] = None):
+def export_to_csv(courses: List[Dict], filename: str, completed_courses: Optional[FrozenSet[str]] = None,
+                  eligibility: Optional[Dict[str, bool]] = None):
     """Export courses to CSV file"""
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
             fieldnames = ['Course Code', 'Majors', 'Level', 'Prerequisites', 'Description']
             if completed_courses:
                 fieldnames.append('Status')
             
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
             
             # Determine eligibility if completed courses provided
             eligibility_info = {}
             if completed_courses:
-                eligible_courses = get_eligible_courses(courses, completed_courses)
-                for course in eligible_courses:
-                    code = course['course_code']
-                    if code in completed_courses:
-                        eligibility_info[code] = 'Completed'
-                    elif course['prereqs_met']:
-                        eligibility_info[code] = 'Eligible'
-                    else:
-                        eligibility_info[code] = 'Need Prerequisites'
-            
-            for course in courses:
-                prereqs = parse_prerequisites(course['full_description'])
-                row = {
-                    'Course Code': course['course_code'],
-                    'Majors': course['majors'],
-                    'Level': 'Graduate' if is_graduate_course(course) else 'Undergraduate',
-                    'Prerequisites': format_prerequisites_for_display(prereqs),
-                    'Description': course['full_description']
+                if eligibility is None:
+                    eligibility = compute_eligibility(courses, completed_courses)
+                eligibility_info = {
+                    code: 'Completed' if code in completed_courses else
+                          'Eligible' if prereqs_met else 'Need Prerequisites'
+                    for code, prereqs_met in eligibility.items()
                 }
-                
-                if completed_courses:
-                    row['Status'] = eligibility_info.get(course['course_code'], 'Unknown')
-                
-                writer.writerow(row)
+            
+            # Stream rows as tuples in fieldnames order
+            rows = ((course['course_code'], course['majors'], course['_level'],
+                     course['_prereqs_text'], course['full_description'])
+                    for course in courses)
+            if completed_courses:
+                rows = (row + (eligibility_info.get(row[0], 'Unknown'),) for row in rows)
+            
+            writer.writerows(rows)
         
         print(f"{colorize('✓', Colors.GREEN)} Exported {len(courses)} courses to {colorize(filename, Colors.CYAN)}")
         
@@ -338,7 +341,7 @@ Examples:
                            help='Show only graduate courses')
     
     # Filtering options
-    parser.add_argument('-m', '--major', choices=['EE', 'CpE', 'CS', 'IT', 'EE2', 'CpE1', 'EE3'],
+    parser.add_argument('-m', '--major', choices=MAJOR_CHOICES,
                        help='Filter by major')
 
     
@@ -352,17 +355,12 @@ Examples:
     parser.add_argument('-s', '--stats', action='store_true',
                        help='Show course statistics')
     parser.add_argument('--output', help='Export results to CSV file')
+    parser.add_argument('--no-table', action='store_true',
+                       help='Skip the course listing (e.g. with --stats or --output)')
     
     args = parser.parse_args()
     
-    # Validate arguments
-    if not os.path.exists(args.pdf_file):
-        print(f"{colorize('Error:', Colors.RED)} PDF file '{args.pdf_file}' not found.")
-        sys.exit(1)
-    
-
-    
-    # Validate PDF file exists
+    # Validate PDF file exists (isfile is False for missing paths too, so one stat covers both)
     if not os.path.isfile(args.pdf_file):
         print(f"{colorize('Error:', Colors.RED)} PDF file '{args.pdf_file}' not found.")
         sys.exit(1)
@@ -370,58 +368,60 @@ Examples:
     # Show Grove header
     show_grove_header()
     
-    # Load course data
-    print(f"{colorize('Loading course data from PDF...', Colors.CYAN)}")
-    try:
-        pdf_text = extract_courses_data(args.pdf_file)
-        all_courses = parse_courses(pdf_text)
-        print(f"{colorize('[OK]', Colors.GREEN)} Loaded {len(all_courses)} courses")
-    except FileNotFoundError:
-        print(f"{colorize('Error:', Colors.RED)} PDF file '{args.pdf_file}' not found.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"{colorize('Error:', Colors.RED)} Failed to load PDF: {e}")
-        print(f"{colorize('Tip:', Colors.YELLOW)} Make sure the PDF contains structured course information.")
-        sys.exit(1)
-    
-    # Load completed courses if provided
+    # Load completed courses if provided (before the PDF, so a bad path fails fast)
     completed_courses = []
     if args.course_history:
         completed_courses = load_completed_courses(args.course_history)
         print(f"{colorize('[OK]', Colors.GREEN)} Loaded {len(completed_courses)} completed courses")
     
-
-    
-    # Apply filters
-    filtered_courses = all_courses
-    
-    # Filter by academic level
-    if args.undergrad:
-        filtered_courses = filter_by_academic_level(filtered_courses, 'undergraduate')
-    elif args.graduate:
-        filtered_courses = filter_by_academic_level(filtered_courses, 'graduate')
+    # Immutable set form for O(1) membership checks in the display/export helpers
+    completed_set = frozenset(completed_courses)
     
-    # Filter by major
-    if args.major:
-        if args.major in ['CS', 'IT']:
-            print(f"{colorize('Note:', Colors.YELLOW)} {args.major} courses not yet supported in this PDF.")
-            filtered_courses = []
-        else:
-            filtered_courses = search_courses_by_major(filtered_courses, args.major)
+    # The catalog has no CS/IT courses, so don't bother parsing it for them
+    if args.major in ['CS', 'IT']:
+        print(f"{colorize('Note:', Colors.YELLOW)} {args.major} courses not yet supported in this PDF.")
+        filtered_courses = []
+    else:
+        # Load course data
+        print(f"{colorize('Loading course data from PDF...', Colors.CYAN)}")
+        try:
+            all_courses = load_courses(args.pdf_file)
+            print(f"{colorize('[OK]', Colors.GREEN)} Loaded {len(all_courses)} courses")
+        except FileNotFoundError:
+            print(f"{colorize('Error:', Colors.RED)} PDF file '{args.pdf_file}' not found.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"{colorize('Error:', Colors.RED)} Failed to load PDF: {e}")
+            print(f"{colorize('Tip:', Colors.YELLOW)} Make sure the PDF contains structured course information.")
+            sys.exit(1)
+        
+        # Apply level and major filters in a single pass over the catalog.
+        # Graduate students can take any course, so --graduate keeps everything.
+        undergrad_only = args.undergrad
+        major = args.major
+        filtered_courses = [
+            course for course in all_courses
+            if not (undergrad_only and course['_is_grad'])
+            and (not major or major in course['_major_set'])
+        ]
     
-
+    # Check prerequisites once and share the result with every display/export helper
+    eligibility = {}
+    if completed_set:
+        eligibility = compute_eligibility(filtered_courses, completed_set)
     
     # Show statistics if requested
     if args.stats:
-        display_stats(filtered_courses, completed_courses)
+        display_stats(filtered_courses, completed_set, eligibility)
     
-    # Display results
-    if not args.stats or len(filtered_courses) > 0:
-        display_table(filtered_courses, args.verbose, completed_courses)
+    # Display results (skipped on request, or when just exporting to CSV from a script or pipe)
+    export_only = args.output and not args.verbose and not _IS_TTY
+    if not args.no_table and not export_only and (not args.stats or len(filtered_courses) > 0):
+        display_table(filtered_courses, args.verbose, completed_set, eligibility)
     
     # Export to CSV if requested
     if args.output:
-        export_to_csv(filtered_courses, args.output, completed_courses)
+        export_to_csv(filtered_courses, args.output, completed_set, eligibility)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,30 +1,78 @@
 import pymupdf as pdf 
 import re
+import os
+import sys
+import hashlib
+import pickle
+import tempfile
+from pathlib import Path
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+# A course with its prerequisite status, as returned by get_eligible_courses
+EligibleCourse = namedtuple('EligibleCourse', 'course prerequisites prereqs_met missing_prereqs is_graduate')
+
+# Parsed catalogs are cached in ~/.cache/grove so repeat runs on the same PDF skip
+# extraction. Bump CACHE_VERSION whenever parse_courses changes the fields it stores
+# or the rules it parses them with (e.g. the prerequisite or graduate-level patterns).
+CACHE_VERSION = 7
+
+# Patterns used on every catalog line or course, compiled once at import
+
+# A line listing only major abbreviations (e.g. "EE, CpE")
+_MAJORS_LINE_RE = re.compile(r'^(EE|CpE|EE2|CpE1|EE3)(,\s*(EE|CpE|EE2|CpE1|EE3))*\s*$')
+
+# A course code at the start of a line (like EEE 5353, EEL 4140C, etc.)
+_COURSE_LINE_RE = re.compile(r'^([A-Z]{3}\s+\d{4}[A-Z]?)')
+
+# A "PR:", "Prerequisite(s):" or "Prerequisites:" section, up to the next period
+_PREREQ_SECTION_RE = re.compile(r'(?:PR|Prerequisite\(s\)|Prerequisites):\s*([^.]+)', re.IGNORECASE)
+
+# A course code anywhere in a prerequisite section
+_COURSE_CODE_RE = re.compile(r'[A-Z]{3}\s*\d{4}[A-Z]?')
+
+# Runs of whitespace, collapsed when normalizing course codes
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Four-digit course number anywhere in a course code, for codes not in the usual
+# "EEE 5353" shape (the common case is read by slicing in _is_graduate)
+_COURSE_NUMBER_RE = re.compile(r'(\d{4})')
+
+# Phrases in a (lowercased) description that mark a course as graduate-level
+_GRAD_INDICATORS = (
+    'graduate standing',
+    'grad standing',
+    'admission to mat degree',
+    'graduate student',
+    'pr: graduate',
+    'prerequisite: graduate',
+)
+
+def iter_pdf_lines(pdf_path):
+    """Yield the text lines of a PDF one page at a time"""
+    # The catalog is always a PDF, so skip format detection
+    doc = pdf.open(pdf_path, filetype="pdf")
+    try:
+        for page_number in range(doc.page_count):
+            yield from doc.load_page(page_number).get_text().split('\n')
+    finally:
+        doc.close()
 
 def extract_courses_data(pdf_path):
     """Extract courses data from PDF and return structured information"""
-    doc = pdf.open(pdf_path)
-    all_text = ""
-    
-    # Extract all text from PDF pages
-    for page in doc:
-        text = page.get_text()
-        all_text += text + "\n"
-    
-    doc.close()
-    return all_text
+    return '\n'.join(iter_pdf_lines(pdf_path)) + '\n'
 
 def parse_courses(text):
-    """Parse the course text and extract course information with majors"""
+    """Parse the course text (a string or an iterable of lines) and extract course information with majors"""
     courses = []
     
     # Split text into lines and process
-    lines = text.split('\n')
+    lines = text.split('\n') if isinstance(text, str) else text
     
     current_course = {}
     current_majors = ""
     
-    for i, line in enumerate(lines):
+    for line in lines:
         line = line.strip()
         
         # Skip empty lines and page headers
@@ -32,12 +80,12 @@ def parse_courses(text):
             continue
             
         # Check if line contains only major abbreviations (EE, CpE, etc.)
-        if re.match(r'^(EE|CpE|EE2|CpE1|EE3)(,\s*(EE|CpE|EE2|CpE1|EE3))*\s*$', line):
+        if _MAJORS_LINE_RE.match(line):
             current_majors = line
             continue
         
         # Check if line starts with a course code (like EEE 5353, EEL 4140C, etc.)
-        course_match = re.match(r'^([A-Z]{3}\s+\d{4}[A-Z]?)', line)
+        course_match = _COURSE_LINE_RE.match(line)
         if course_match:
             # Save previous course if exists
             if current_course and current_majors:
@@ -59,38 +107,118 @@ def parse_courses(text):
         current_course['majors'] = current_majors
         courses.append(current_course)
     
+    # Classify each finished course once; later lookups read these fields
+    for course in courses:
+        course['_majors_tuple'] = _split_majors(course['majors'])
+        course['_major_set'] = frozenset(course['_majors_tuple'])
+        course['_desc_lower'] = course['full_description'].lower()
+        course['_is_grad'] = is_graduate_course(course)
+        course['_prereqs'] = parse_prerequisites(course['full_description'])
+    
     return courses
 
+def _cache_dir():
+    """Directory for cached catalogs (Path.home() raises RuntimeError if there is no home)"""
+    return Path.home() / '.cache' / 'grove'
+
+def _catalog_cache_name(pdf_path):
+    """Cache file name for a PDF, keyed by its path, size and modification time"""
+    stat = os.stat(pdf_path)
+    key_source = f"{os.path.abspath(pdf_path)}:{stat.st_mtime_ns}:{stat.st_size}:{CACHE_VERSION}"
+    key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+    return f"{key}.pkl"
+
+def load_courses_cached(pdf_path):
+    """Parse courses from the PDF, reusing the cached result when the file hasn't changed"""
+    cache_name = _catalog_cache_name(pdf_path)
+    try:
+        with open(_cache_dir() / cache_name, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass  # Missing or unreadable cache, or no home directory: parse the PDF
+    
+    courses = parse_courses(iter_pdf_lines(pdf_path))
+    
+    # Write to a temp file and rename so an interrupted run never leaves a partial cache
+    try:
+        cache_dir = _cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(courses, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_dir / cache_name)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, RuntimeError):
+        pass  # Caching is best-effort; a read-only or missing home just means no speedup
+    
+    return courses
+
+def _split_majors(majors):
+    """Split a majors string like "EE, CpE" into its major names"""
+    return tuple(major.strip() for major in majors.split(','))
+
+def _course_majors(course):
+    """A course's major names, cached by parse_courses or split from 'majors'"""
+    majors = course.get('_majors_tuple')
+    if majors is None:
+        majors = _split_majors(course['majors'])
+    return majors
+
+def _course_major_set(course):
+    """A course's major names as a set, cached by parse_courses or split from 'majors'"""
+    major_set = course.get('_major_set')
+    if major_set is None:
+        major_set = frozenset(_split_majors(course['majors']))
+    return major_set
+
 def search_courses_by_major(courses, major):
-    """Search for courses that include a specific major"""
+    """Search for courses that list a specific major (whole names, so EE doesn't match EE2)"""
     matching_courses = []
     
     for course in courses:
-        if major in course['majors']:
+        if major in _course_major_set(course):
             matching_courses.append(course)
     
     return matching_courses
 
+def build_major_index(courses):
+    """Map each major to the courses listing it, matching whole major names only"""
+    index = {}
+    for course in courses:
+        for major in _course_majors(course):
+            index.setdefault(major, []).append(course)
+    return index
+
 def display_courses(courses, major=None):
     """Display courses in a readable format"""
+    # Collect the listing and write it once rather than printing line by line
+    lines = []
     if major:
-        print(f"\n=== Courses for {major} Major ===")
+        lines.append(f"\n=== Courses for {major} Major ===")
     else:
-        print(f"\n=== All Courses ===")
+        lines.append(f"\n=== All Courses ===")
     
-    print(f"Found {len(courses)} courses\n")
+    lines.append(f"Found {len(courses)} courses\n")
     
     for i, course in enumerate(courses, 1):
-        print(f"{i}. {course['course_code']}")
-        print(f"   Majors: {course['majors']}")
-        print(f"   Description: {course['full_description'][:200]}...")
-        print("-" * 80)
+        lines.append(f"{i}. {course['course_code']}")
+        lines.append(f"   Majors: {course['majors']}")
+        lines.append(f"   Description: {course['full_description'][:200]}...")
+        lines.append("-" * 80)
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def interactive_search(courses):
     """Interactive search function for better user experience"""
     completed_courses = []
     academic_level = 'undergraduate'  # Default to undergraduate
     
+    # Index the catalog by major once so each major search is a dict lookup
+    major_index = build_major_index(courses)
+    
     while True:
         print("\n" + "="*60)
         print("Technical Electives Search Tool")
@@ -134,7 +262,7 @@ def interactive_search(courses):
             major = parts[1] if len(parts) > 1 else None
             
             if major:
-                filtered_courses = search_courses_by_major(courses, major)
+                filtered_courses = major_index.get(major, [])
                 if not filtered_courses:
                     print(f"No courses found for major: {major}")
                     continue
@@ -152,7 +280,7 @@ def interactive_search(courses):
                 display_eligible_courses(eligible, show_all=True, academic_level=academic_level)
                 
         else:
-            matching_courses = search_courses_by_major(courses, choice)
+            matching_courses = major_index.get(choice, [])
             if matching_courses:
                 display_courses(matching_courses, choice)
             else:
@@ -177,12 +305,7 @@ def show_statistics(courses):
     print(f"  Graduate courses: {grad_count}")
     
     # Count by major
-    major_counts = {}
-    for course in courses:
-        majors = course['majors'].split(', ')
-        for major in majors:
-            major = major.strip()
-            major_counts[major] = major_counts.get(major, 0) + 1
+    major_counts = Counter(major for course in courses for major in _course_majors(course))
     
     print("\nCourses per major:")
     for major, count in sorted(major_counts.items()):
@@ -190,77 +313,69 @@ def show_statistics(courses):
 
 def parse_prerequisites(description):
     """Extract prerequisites from course description"""
-    prereqs = []
-    
+    return list(_parse_prerequisites_cached(description))
+
+@lru_cache(maxsize=4096)
+def _parse_prerequisites_cached(description):
+    """Memoized prerequisite parse, keyed on the description text"""
     # Look for "PR:" or "Prerequisite(s):" pattern
-    pr_patterns = [
-        r'PR:\s*([^.]+)',
-        r'Prerequisite\(s\):\s*([^.]+)',
-        r'Prerequisites:\s*([^.]+)'
-    ]
-    
-    for pattern in pr_patterns:
-        match = re.search(pattern, description, re.IGNORECASE)
-        if match:
-            prereq_text = match.group(1).strip()
-            # Extract course codes (like EEE 3307C, EEL 4750, etc.)
-            course_codes = re.findall(r'[A-Z]{3}\s*\d{4}[A-Z]?', prereq_text)
-            prereqs.extend(course_codes)
-            break
+    match = _PREREQ_SECTION_RE.search(description)
+    if not match:
+        return ()
     
-    return prereqs
+    # Extract course codes (like EEE 3307C, EEL 4750, etc.)
+    return tuple(_COURSE_CODE_RE.findall(match.group(1).strip()))
 
 def check_prerequisites_met(course_prereqs, completed_courses):
     """Check if prerequisites are met based on completed courses"""
     if not course_prereqs:
         return True, []
     
+    return _check_against_set(course_prereqs, _normalize_completed(completed_courses))
+
+def normalize_course_code(code):
+    """Normalize a course code for comparison: trimmed, single-spaced, upper-case"""
+    return _WHITESPACE_RE.sub(' ', code.strip()).upper()
+
+def _normalize_completed(completed_courses):
+    """Normalize completed courses into a set so each prerequisite is a set lookup"""
+    return {normalize_course_code(completed) for completed in completed_courses}
+
+def _check_against_set(course_prereqs, completed_set):
+    """check_prerequisites_met against an already-normalized completed set"""
     missing_prereqs = []
     for prereq in course_prereqs:
-        # Normalize the course code format
-        normalized_prereq = re.sub(r'\s+', ' ', prereq.strip())
-        found = False
-        
-        for completed in completed_courses:
-            normalized_completed = re.sub(r'\s+', ' ', completed.strip())
-            if normalized_prereq.upper() == normalized_completed.upper():
-                found = True
-                break
-        
-        if not found:
+        if normalize_course_code(prereq) not in completed_set:
             missing_prereqs.append(prereq)
     
     return len(missing_prereqs) == 0, missing_prereqs
 
 def is_graduate_course(course):
     """Determine if a course is graduate-level based on course number and description"""
-    course_code = course['course_code']
-    description = course['full_description']
+    if '_is_grad' in course:
+        return course['_is_grad']
+    description_lower = course.get('_desc_lower')
+    if description_lower is None:
+        description_lower = course['full_description'].lower()
+    return _is_graduate(course['course_code'], description_lower)
+
+@lru_cache(maxsize=4096)
+def _is_graduate(course_code, description_lower):
+    """Memoized graduate-level check, keyed on course code and lowercased description"""
+    # Extract course number: the four digits after the three-letter prefix
+    digits = course_code[3:].lstrip()[:4]
+    if course_code[:3].isalpha() and len(digits) == 4 and digits.isdecimal():
+        course_number = int(digits)
+    else:
+        number_match = _COURSE_NUMBER_RE.search(course_code)
+        course_number = int(number_match.group(1)) if number_match else None
     
-    # Extract course number
-    number_match = re.search(r'(\d{4})', course_code)
-    if number_match:
-        course_number = int(number_match.group(1))
-        # Courses 5000+ are typically graduate level
-        if course_number >= 5000:
-            return True
+    # Courses 5000+ are typically graduate level
+    if course_number is not None and course_number >= 5000:
+        return True
     
     # Check for graduate standing requirement in description
-    grad_indicators = [
-        'graduate standing',
-        'grad standing', 
-        'admission to mat degree',
-        'graduate student',
-        'pr: graduate',
-        'prerequisite: graduate'
-    ]
-    
-    description_lower = description.lower()
-    for indicator in grad_indicators:
-        if indicator in description_lower:
-            return True
-    
-    return False
+    return any(indicator in description_lower for indicator in _GRAD_INDICATORS)
 
 def filter_by_academic_level(courses, academic_level):
     """Filter courses based on academic level (undergraduate/graduate)"""
@@ -275,27 +390,31 @@ def get_eligible_courses(courses, completed_courses, major=None, academic_level=
     """Get courses that can be taken based on completed prerequisites and academic level"""
     eligible = []
     
-    # First filter by academic level
-    level_filtered_courses = filter_by_academic_level(courses, academic_level)
+    # Undergraduates can't take graduate courses (same rule as filter_by_academic_level)
+    undergrad_only = academic_level.lower() == 'undergraduate'
     
-    for course in level_filtered_courses:
+    # Normalize completed courses once for the whole pass, not once per course
+    completed_set = _normalize_completed(completed_courses)
+    
+    # Level filter, major filter and prerequisite check in a single pass
+    for course in courses:
+        is_grad = is_graduate_course(course)
+        if undergrad_only and is_grad:
+            continue
+        
         # Filter by major if specified
-        if major and major not in course['majors']:
+        if major and major not in _course_major_set(course):
             continue
         
-        # Parse prerequisites
-        prereqs = parse_prerequisites(course['full_description'])
+        # Parse prerequisites (already done for courses from parse_courses)
+        prereqs = course.get('_prereqs')
+        if prereqs is None:
+            prereqs = parse_prerequisites(course['full_description'])
         
         # Check if prerequisites are met
-        prereqs_met, missing = check_prerequisites_met(prereqs, completed_courses)
-        
-        course_info = course.copy()
-        course_info['prerequisites'] = prereqs
-        course_info['prereqs_met'] = prereqs_met
-        course_info['missing_prereqs'] = missing
-        course_info['is_graduate'] = is_graduate_course(course)
+        prereqs_met, missing = _check_against_set(prereqs, completed_set)
         
-        eligible.append(course_info)
+        eligible.append(EligibleCourse(course, tuple(prereqs), prereqs_met, missing, is_grad))
     
     return eligible
 
@@ -305,7 +424,8 @@ def input_completed_courses():
     print("Enter course codes one by one (e.g., EEE 3307C, EEL 4750)")
     print("Type 'done' when finished, 'clear' to start over")
     
-    completed = []
+    # Dict keys act as an ordered set: O(1) duplicate checks, entry order kept
+    completed = {}
     
     while True:
         course = input("Enter course code (or 'done'/'clear'): ").strip()
@@ -313,24 +433,33 @@ def input_completed_courses():
         if course.lower() == 'done':
             break
         elif course.lower() == 'clear':
-            completed = []
+            completed = {}
             print("Cleared all courses.")
             continue
         elif course == '':
             continue
         else:
             # Validate course code format
-            if re.match(r'^[A-Z]{3}\s*\d{4}[A-Z]?$', course.upper()):
-                normalized_course = re.sub(r'\s+', ' ', course.upper())
+            if _is_valid_course_code(course.upper()):
+                normalized_course = normalize_course_code(course)
                 if normalized_course not in completed:
-                    completed.append(normalized_course)
+                    completed[normalized_course] = None
                     print(f"Added: {normalized_course}")
                 else:
                     print(f"Already added: {normalized_course}")
             else:
                 print("Invalid format. Use format like: EEE 3307C or EEL 4750")
     
-    return completed
+    return list(completed)
+
+def _is_valid_course_code(code):
+    """Check for three letters, optional whitespace, four digits and an optional letter"""
+    prefix = code[:3]
+    rest = code[3:].lstrip()
+    number, suffix = rest[:4], rest[4:]
+    return (len(prefix) == 3 and prefix.isascii() and prefix.isalpha() and prefix.isupper()
+            and len(number) == 4 and number.isdecimal()
+            and (suffix == '' or (len(suffix) == 1 and suffix.isascii() and suffix.isalpha() and suffix.isupper())))
 
 def input_academic_level():
     """Allow user to input their academic level"""
@@ -350,40 +479,41 @@ def input_academic_level():
 
 def display_eligible_courses(eligible_courses, show_all=False, academic_level='undergraduate'):
     """Display eligible courses with prerequisite information"""
+    lines = []
     if show_all:
         courses_to_show = eligible_courses
-        print(f"\n=== All Courses with Prerequisite Status ===")
+        lines.append(f"\n=== All Courses with Prerequisite Status ===")
     else:
-        courses_to_show = [c for c in eligible_courses if c['prereqs_met']]
-        print(f"\n=== Courses You Can Take ===")
+        courses_to_show = [c for c in eligible_courses if c.prereqs_met]
+        lines.append(f"\n=== Courses You Can Take ===")
     
-    print(f"Found {len(courses_to_show)} courses\n")
+    lines.append(f"Found {len(courses_to_show)} courses\n")
     
-    for i, course in enumerate(courses_to_show, 1):
-        status = "✓ ELIGIBLE" if course['prereqs_met'] else "✗ NOT ELIGIBLE"
-        grad_indicator = " [GRAD]" if course.get('is_graduate', False) else ""
-        print(f"{i}. {course['course_code']}{grad_indicator} - {status}")
-        print(f"   Majors: {course['majors']}")
+    for i, entry in enumerate(courses_to_show, 1):
+        course = entry.course
+        status = "✓ ELIGIBLE" if entry.prereqs_met else "✗ NOT ELIGIBLE"
+        grad_indicator = " [GRAD]" if entry.is_graduate else ""
+        lines.append(f"{i}. {course['course_code']}{grad_indicator} - {status}")
+        lines.append(f"   Majors: {course['majors']}")
         
-        if course['prerequisites']:
-            print(f"   Prerequisites: {', '.join(course['prerequisites'])}")
-            if not course['prereqs_met']:
-                print(f"   Missing: {', '.join(course['missing_prereqs'])}")
+        if entry.prerequisites:
+            lines.append(f"   Prerequisites: {', '.join(entry.prerequisites)}")
+            if not entry.prereqs_met:
+                lines.append(f"   Missing: {', '.join(entry.missing_prereqs)}")
         else:
-            print(f"   Prerequisites: None")
+            lines.append(f"   Prerequisites: None")
         
-        print(f"   Description: {course['full_description'][:150]}...")
-        print("-" * 80)
+        lines.append(f"   Description: {course['full_description'][:150]}...")
+        lines.append("-" * 80)
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 # Main execution
 if __name__ == "__main__":
     print("Loading course data from PDF...")
     
-    # Extract text from PDF
-    pdf_text = extract_courses_data("EE-CPE-TechnicalElectiveListSept2025[56].pdf")
-    
-    # Parse courses
-    all_courses = parse_courses(pdf_text)
+    # Parse courses (or reuse the cached parse of an unchanged PDF)
+    all_courses = load_courses_cached("EE-CPE-TechnicalElectiveListSept2025[56].pdf")
     
     print(f"Successfully loaded {len(all_courses)} courses!")
     